@@ -1,33 +1,68 @@
 """Cleans csvs to remove all missining dates and replaces missing tags with 'unknown'"""
 
+import argparse
 import pandas as pd
 
-# Load the CSV file with ; delimiter
-file_path = 'Kaggle_final_test.csv'  
-df = pd.read_csv(file_path, delimiter=';')
-
-# Function to clean the 4th column
-def clean_column(value):
-    if pd.isna(value):  # Skip if the value is missing
-        return value
-    if ';' in str(value):  # Check if the value contains multiple parts
-        parts = str(value).split(';')  # Split by ;
-        if len(parts) >= 2:
-            return parts[1]  # Return the middle value
-    return value  # Return the original value if no cleaning is needed
-
-# Apply the cleaning function to the 4th column
-fourth_column = df.columns[3]  # Assuming the 4th column is at index 3
-df[fourth_column] = df[fourth_column].apply(clean_column)
-
-# Check the second last column and replace missing values with 'unknown'
-second_last_column = df.columns[-2]  # Get the name of the second last column
-df[second_last_column] = df[second_last_column].fillna('unknown')
-df = df.dropna()
-
-# Save the modified CSV
-output_file_path = 'Kaggle_clean_metadata.csv'  # Replace with your desired output file path
-df.to_csv(output_file_path, sep=';', index=False)
-
-print(f"Modified CSV saved to {output_file_path}")
-print("end")
+# Columns cleaned by name, matching the metadata written by CSVgenerationAPI
+DATE_COLUMN = "date_column"
+TAGS_COLUMN = "Tags"
+
+# Strings read_csv treats as missing by default, so in-memory metadata is cleaned like a re-read file
+NA_TOKENS = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+def clean_metadata(df, date_col=DATE_COLUMN, tags_col=TAGS_COLUMN):
+    """
+    Cleans a metadata DataFrame with vectorised string operations.
+    - Date columns holding several names separated by ';' keep the middle (second) one.
+    - Missing tags are replaced with 'unknown'.
+    - Rows with any remaining missing value are dropped.
+    Values equal to read_csv's default NA strings (e.g. "None") count as missing, so cleaning
+    a DataFrame in memory and cleaning the same metadata from a file give the same rows.
+    """
+    missing = [col for col in (date_col, tags_col) if col not in df.columns]
+    if missing:
+        raise KeyError(f"Metadata is missing the required columns: {missing}")
+
+    df = df.mask(df.isin(NA_TOKENS))
+    dates = df[date_col].astype("string")
+    multiple = dates.str.contains(";", regex=False).fillna(False).to_numpy(dtype=bool)
+    df.loc[multiple, date_col] = dates[multiple].str.split(";").str[1]
+
+    df[tags_col] = df[tags_col].fillna('unknown')
+    return df.dropna()
+
+def clean_metadata_file(input_path, output_path, chunksize=None, date_col=DATE_COLUMN, tags_col=TAGS_COLUMN):
+    """
+    Cleans a ';' delimited metadata CSV. With `chunksize`, the file is processed in chunks
+    so it never has to fit in memory at once; the output is identical either way.
+    """
+    # Read every column as text so values are written back verbatim, whatever the chunking
+    if chunksize is None:
+        chunks = [pd.read_csv(input_path, delimiter=';', dtype=str, keep_default_na=True)]
+    else:
+        chunks = pd.read_csv(input_path, delimiter=';', dtype=str, keep_default_na=True, chunksize=chunksize)
+
+    rows = 0
+    for i, chunk in enumerate(chunks):
+        cleaned = clean_metadata(chunk, date_col=date_col, tags_col=tags_col)
+        cleaned.to_csv(output_path, sep=';', index=False, mode='w' if i == 0 else 'a', header=i == 0)
+        rows += len(cleaned)
+
+    print(f"Modified CSV saved to {output_path} ({rows} rows)")
+    return rows
+
+# Main Script
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("input", nargs="?", default="Kaggle_final_test.csv", help="Metadata CSV to clean")
+    arg_parser.add_argument("output", nargs="?", default="Kaggle_clean_metadata.csv", help="Cleaned CSV path")
+    arg_parser.add_argument("--chunksize", type=int, default=None, help="Rows per chunk, reads the whole file if omitted")
+    arg_parser.add_argument("--date-column", default=DATE_COLUMN, help="Column holding the date column names")
+    arg_parser.add_argument("--tags-column", default=TAGS_COLUMN, help="Column holding the dataset tags")
+    args = arg_parser.parse_args()
+
+    clean_metadata_file(args.input, args.output, chunksize=args.chunksize,
+                        date_col=args.date_column, tags_col=args.tags_column)
@@ -4,6 +4,7 @@ import os
 import pandas as pd
 from kaggle.api.kaggle_api_extended import KaggleApi
 from dateutil import parser
+from CSVcleaning import clean_metadata
 
 # Authenticate Kaggle API and download datasets
 # Ensure the Kaggle API credentials are set up in ~/.kaggle/kaggle.json
@@ -121,9 +122,11 @@ def process_kaggle_datasets(kaggle_datasets, download_base_path, domain_mapping)
 
     return all_metadata
 
-def save_metadata_to_csv(metadata_list, output_csv):
+def save_metadata_to_csv(metadata_list, output_csv, clean_output_csv=None):
     """
     Saves metadata to a CSV file in the specified column order.
+    If `clean_output_csv` is given, the cleaned metadata is written there as well,
+    straight from memory instead of re-reading the saved file.
     """
     df = pd.DataFrame(metadata_list)
 
@@ -137,6 +140,10 @@ def save_metadata_to_csv(metadata_list, output_csv):
     df.to_csv(output_csv, sep=';', index=False)
     print(f"Metadata saved to {output_csv}")
 
+    if clean_output_csv:
+        clean_metadata(df).to_csv(clean_output_csv, sep=';', index=False)
+        print(f"Cleaned metadata saved to {clean_output_csv}")
+
 # Main Script
 if __name__ == "__main__":
     excel_file_path = "Kaggle_dataset_list.xlsx"
@@ -154,6 +161,7 @@ if __name__ == "__main__":
 
     download_base_path = "./kaggle_datasets"
     output_csv = "Kaggle_metadata.csv"
+    clean_output_csv = "Kaggle_clean_metadata.csv"
 
     metadata_list = process_kaggle_datasets(kaggle_datasets, download_base_path, domain_mapping)
-    save_metadata_to_csv(metadata_list, output_csv)
\ No newline at end of file
+    save_metadata_to_csv(metadata_list, output_csv, clean_output_csv=clean_output_csv)
\ No newline at end of file
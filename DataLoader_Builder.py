@@ -6,6 +6,8 @@ import datasets
 import subprocess
 from tqdm import tqdm
 from huggingface_hub import hf_hub_download
+from .series_codec import encode_example
+from .split_engine import plan_splits, holdout_mask, TRAIN, TEST
 
 # ======================================================================
 # GLOBAL CONFIGURATION
@@ -80,8 +82,18 @@ class TimeSeriesDatasetConfig(datasets.BuilderConfig):
     """
     Custom configuration class extending Hugging Face's BuilderConfig.
     Stores the loaded dataset configurations.
+    When `compact` is set, dates and values are written with the compact
+    encoding from series_codec and decoded with `series_codec.decode_batch`.
+    The split fields select how split_engine assigns series to train and test.
     """
     datasets_config: Optional[Dict[str, Dict[str, Any]]] = None
+    compact: bool = False
+    split_mode: str = "dataset"  # "dataset" (hash of datasetID) or "temporal" (per-series cutoff)
+    test_fraction: float = 0.2  # Share of datasets assigned to test in "dataset" mode
+    split_seed: str = ""  # Changes the hash-based assignment while keeping it reproducible
+    holdout_points: Optional[int] = None  # "temporal" mode: last N points of each series go to test
+    holdout_fraction: Optional[float] = None  # "temporal" mode: last share of each series' DataPoints go to test
+    holdout_date: Optional[str] = None  # "temporal" mode: points on or after this date go to test
 
 # ======================================================================
 # MAIN DATASET BUILDER CLASS
@@ -98,12 +110,20 @@ class TimeSeriesDataset(datasets.GeneratorBasedBuilder):
     VERSION = datasets.Version(_VERSION)
 
     # Define dataset configuration for Hugging Face
+    _datasets_config = load_datasets_config()
     BUILDER_CONFIGS = [
         TimeSeriesDatasetConfig(
             name="TIME_SERIES",
             version=datasets.Version(_VERSION),
             description="Multiple univariate and multivariate datasets",
-            datasets_config=load_datasets_config()
+            datasets_config=_datasets_config
+        ),
+        TimeSeriesDatasetConfig(
+            name="TIME_SERIES_COMPACT",
+            version=datasets.Version(_VERSION),
+            description="Multiple univariate and multivariate datasets with compressed dates and values",
+            datasets_config=_datasets_config,
+            compact=True
         )
     ]
 
@@ -114,13 +134,28 @@ class TimeSeriesDataset(datasets.GeneratorBasedBuilder):
         Returns:
             datasets.DatasetInfo: Contains feature definitions and metadata
         """
+        if self.config.compact:
+            series_features = {
+                "date_start": datasets.Value("int64"),  # First timestamp since epoch, in date_unit
+                "date_freq": datasets.Value("int64"),  # Sampling interval in date_unit, 0 if irregular
+                "date_delta": datasets.Value("binary"),  # zstd-compressed int64 deltas for irregular series
+                "date_unit": datasets.Value("string"),  # numpy datetime unit of the ticks above ("ns", "s", ...)
+                "value": datasets.Value("binary"),  # Byte-shuffle + zstd encoded float32 matrix, optionally delta-encoded
+                "value_shape": datasets.Sequence(datasets.Value("int64")),  # [n_columns, n_points]
+                "value_delta": datasets.Value("bool"),  # Whether the value bit patterns are delta-encoded
+            }
+        else:
+            series_features = {
+                "date": datasets.Value("string"),
+                "value": datasets.Sequence(datasets.Sequence(datasets.Value("float32"))),  # List of lists of floats for multivariate
+            }
+
         return datasets.DatasetInfo(
             description=_DESCRIPTION,
             citation=_CITATION,
             features=datasets.Features({
                 "name": datasets.Value("string"),
-                "date": datasets.Value("string"),
-                "value": datasets.Sequence(datasets.Sequence(datasets.Value("float32"))),  # List of lists of floats for multivariate
+                **series_features,
                 "variance": datasets.Value("string"),
                 "domain": datasets.Value("string"),
                 "DataPoints": datasets.Value("string"),
@@ -165,33 +200,90 @@ class TimeSeriesDataset(datasets.GeneratorBasedBuilder):
     
                     pbar.update(1)  # Update progress bar after each dataset
     
-        # Split the downloaded files into train and test sets
-        filepaths = list(downloaded_files.items())
-        train_size = int(0.8 * len(filepaths))  # 80% for training, 20% for testing
-        train_files = dict(filepaths[:train_size])
-        test_files = dict(filepaths[train_size:])
+        # Split the downloaded files with a plan that depends only on the metadata, not on download order
+        split_plan = plan_splits(
+            self.config.datasets_config,
+            downloaded_files,
+            split_mode=self.config.split_mode,
+            test_fraction=self.config.test_fraction,
+            seed=self.config.split_seed,
+            holdout_points=self.config.holdout_points,
+            holdout_date=self.config.holdout_date,
+            holdout_fraction=self.config.holdout_fraction,
+        )
+
+        # Other side of temporally split files, so each file is parsed once when both splits are
+        # prepared in this process. Streaming iterates splits independently, so nothing is kept there.
+        self._pending_examples = {TRAIN: {}, TEST: {}}
+        self._cache_other_side = not getattr(dl_manager, "is_streaming", False)
+        self._generated_splits = set()
     
         return [
             datasets.SplitGenerator(
                 name=datasets.Split.TRAIN,
-                gen_kwargs={"filepaths": train_files}
+                gen_kwargs={"filepaths": split_plan[TRAIN], "split": TRAIN}
             ),
             datasets.SplitGenerator(
                 name=datasets.Split.TEST,
-                gen_kwargs={"filepaths": test_files}
+                gen_kwargs={"filepaths": split_plan[TEST], "split": TEST}
             )
         ]
 
-    def _generate_examples(self, filepaths):
+    def _build_example(self, dataset_name, dataset_info, df):
+        """
+        Builds one example from the rows of a parsed dataset file.
+
+        Returns:
+            dict: Processed dataset example, or None if the data column is missing
+        """
+        date_col = dataset_info["date_column"]
+        dates = df[date_col] if self.config.compact else df[date_col].tolist()
+        
+        data_columns = dataset_info["data_column"]
+        domain = dataset_info["domain"]
+        DataPoints = dataset_info["DataPoints"]
+        variance = dataset_info["variance"]
+        values = []
+
+        if isinstance(data_columns, list):
+            for col in data_columns:
+                if col in df.columns:
+                    values.append(df[col].astype(float).tolist())  # Ensure values are floats
+                else:
+                    print(f"Specified data column '{col}' not found in the dataset {dataset_name}. Skipping.")
+                    continue
+        else:
+            if data_columns in df.columns:
+                values = [df[data_columns].astype(float).tolist()]  # Wrap single column in a list
+            else:
+                print(f"Specified data column '{data_columns}' not found in the dataset {dataset_name}. Skipping.")
+                return None
+
+        # Store the dataset information in the desired format
+        series = encode_example(dates, values) if self.config.compact else {"date": dates, "value": values}
+        return {
+            "name": dataset_name,
+            **series,
+            "variance": variance,
+            "domain": domain,
+            "DataPoints": DataPoints,
+        }
+
+    def _generate_examples(self, filepaths, split):
         """
         Processes downloaded files into the final dataset format.
+        When preparing (not streaming), temporally split files are parsed once: the side
+        belonging to the other split is kept in `self._pending_examples` and yielded from
+        there. This relies on both splits being generated by the same builder instance, and
+        keeps the held-back side of every file in memory until the other split consumes it.
+        Otherwise (streaming, or the other split already generated) each split parses the file itself.
             
         Yields:
             Tuple[int, dict]: Index and processed dataset example
         """
         all_datasets = []
     
-        for key, filepath in filepaths.items():  # Use the full key with file_name
+        for key, (filepath, cutoff) in filepaths.items():  # Use the full key with file_name
             print(f"Processing key: {key}")
             try:
                 dataset_name, file_name = key.split("|", 1)  # Use | as delimiter
@@ -199,6 +291,12 @@ class TimeSeriesDataset(datasets.GeneratorBasedBuilder):
             except ValueError:
                 print(f"Invalid key format: {key}. Skipping.")
                 continue
+
+            # Reuse the example produced while the other split parsed this file
+            pending = self._pending_examples[split].pop(key, None)
+            if pending is not None:
+                all_datasets.append(pending)
+                continue
     
             dataset_info_list = self.config.datasets_config.get(dataset_name, [])  # Get the list of dataset entries
             
@@ -223,7 +321,15 @@ class TimeSeriesDataset(datasets.GeneratorBasedBuilder):
                     continue
     
                 # Convert date column to string format
-                if df[date_col].dtype in ['int64', 'float64']:  # If column contains years (e.g., 2020)
+                if self.config.compact:
+                    # Keep timestamps as datetime64 so they can be stored as start + frequency or deltas
+                    if df[date_col].dtype in ['int64', 'float64']:  # If column contains years (e.g., 2020)
+                        # Build second resolution dates with numpy: pd.to_datetime turns years outside 1677-2262 into NaT
+                        years = df[date_col].astype(int).astype(str).to_numpy(dtype="datetime64[Y]")
+                        df[date_col] = pd.Series(years.astype("datetime64[s]"), index=df.index)
+                    else:
+                        df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+                elif df[date_col].dtype in ['int64', 'float64']:  # If column contains years (e.g., 2020)
                     df[date_col] = df[date_col].astype(int).astype(str) + "-01-01 00:00:00"
                 else:
                     # Convert date column to string format
@@ -236,42 +342,32 @@ class TimeSeriesDataset(datasets.GeneratorBasedBuilder):
                         df[date_col] = df[date_col].apply(lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) else "0000-01-01 00:00:00")
 
     
-                dates = df[date_col].tolist()
-                
-                data_columns = dataset_info["data_column"]
-                domain = dataset_info["domain"]
-                DataPoints = dataset_info["DataPoints"]
-                variance = dataset_info["variance"]
-                values = []
-    
-                if isinstance(data_columns, list):
-                    for col in data_columns:
-                        if col in df.columns:
-                            values.append(df[col].astype(float).tolist())  # Ensure values are floats
-                        else:
-                            print(f"Specified data column '{col}' not found in the dataset {dataset_name}. Skipping.")
-                            continue
+                if cutoff is None:
+                    example = self._build_example(dataset_name, dataset_info, df)
                 else:
-                    if data_columns in df.columns:
-                        values = [df[data_columns].astype(float).tolist()]  # Wrap single column in a list
-                    else:
-                        print(f"Specified data column '{data_columns}' not found in the dataset {dataset_name}. Skipping.")
-                        continue
-    
-                # Store the dataset information in the desired format
-                all_datasets.append({
-                    "name": dataset_name,
-                    "date": dates,  
-                    "value": values,  
-                    "variance": variance,
-                    "domain": domain,
-                    "DataPoints": DataPoints,
-                })
+                    # Cut the series once and keep the other side for the next split
+                    df = df.sort_values(date_col, kind='stable', na_position='first')  # Files may be stored newest-first
+                    mask = holdout_mask(df[date_col], cutoff)
+                    sides = {TRAIN: df[~mask], TEST: df[mask]}
+                    other = TEST if split == TRAIN else TRAIN
+                    example = self._build_example(dataset_name, dataset_info, sides[split])
+                    other_example = self._build_example(dataset_name, dataset_info, sides[other])
+                    if other_example is not None and self._cache_other_side and other not in self._generated_splits:
+                        self._pending_examples[other][key] = other_example
+
+                if example is not None:
+                    all_datasets.append(example)
     
             except Exception as e:
                 print(f"Error processing {dataset_name} ({filepath}): {e}")
                 continue
     
+        # Nothing cached for this split is needed anymore; once both splits are done, drop everything
+        self._generated_splits.add(split)
+        self._pending_examples[split].clear()
+        if self._generated_splits >= {TRAIN, TEST}:
+            self._pending_examples[TRAIN if split == TEST else TEST].clear()
+
         # Yield all datasets
         for idx, data in enumerate(all_datasets):
-            yield idx, data
\ No newline at end of file
+            yield idx, data
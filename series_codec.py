@@ -0,0 +1,194 @@
+"""Compact encoding of time-series dates and values for the corpus store.
+
+Dates are stored in their native resolution as a start timestamp plus a fixed frequency when
+the series is regularly sampled, otherwise as zstd-compressed int64 deltas.
+Values are stored as a byte-shuffled, zstd-compressed float32 matrix. Delta-encoding the bit
+patterns along the time axis is applied per series, only when it makes the blob smaller.
+Decoding is fully vectorised and can be applied lazily with `dataset.with_transform(decode_batch)`.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    import zstandard
+except ImportError:  # zstandard is only required for the compact encoding
+    zstandard = None
+
+# ======================================================================
+# GLOBAL CONFIGURATION
+# ======================================================================
+
+_ZSTD_LEVEL = 9
+
+# Features written by the builder when the compact encoding is enabled
+COMPACT_FEATURE_NAMES = ["date_start", "date_freq", "date_delta", "date_unit", "value", "value_shape", "value_delta"]
+
+# ======================================================================
+# LOW LEVEL HELPERS
+# ======================================================================
+
+def _require_zstd():
+    """
+    Raises a helpful error if the optional zstandard dependency is missing.
+    """
+    if zstandard is None:
+        raise ImportError("The compact encoding requires the 'zstandard' package: pip install zstandard")
+
+def _compress(buffer):
+    _require_zstd()
+    return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(buffer)
+
+def _decompress(buffer):
+    _require_zstd()
+    return zstandard.ZstdDecompressor().decompress(buffer)
+
+def _shuffle_bytes(array):
+    """
+    Groups the i-th byte of every element together so similar bytes end up adjacent.
+    """
+    return array.view(np.uint8).reshape(-1, array.dtype.itemsize).T.tobytes()
+
+def _unshuffle_bytes(buffer, dtype, count):
+    """
+    Inverse of `_shuffle_bytes`.
+    """
+    dtype = np.dtype(dtype)
+    planes = np.frombuffer(buffer, dtype=np.uint8).reshape(dtype.itemsize, count)
+    return np.ascontiguousarray(planes.T).view(dtype).reshape(count)
+
+# ======================================================================
+# DATE ENCODING
+# ======================================================================
+
+def encode_dates(dates):
+    """
+    Encodes a sequence of timestamps as start + frequency, or as delta-encoded int64.
+    Ticks are kept in the native unit of the dates, so timestamps outside the
+    nanosecond range (before 1677 or after 2262) are stored without wrapping.
+    Timezone-aware dates are stored as naive UTC.
+
+    Returns:
+        dict: {"date_start": int, "date_freq": int, "date_delta": bytes, "date_unit": str}
+              `date_freq` is 0 and `date_delta` holds the compressed deltas for irregular series.
+    """
+    index = pd.DatetimeIndex(dates)
+    if index.tz is not None:
+        index = index.tz_convert(None)
+    unit = np.datetime_data(index.dtype)[0]
+    ticks = index.asi8  # NaT is int64 min
+
+    if len(ticks) <= 1:
+        return {"date_start": int(ticks[0]) if len(ticks) else 0, "date_freq": 0, "date_delta": b"", "date_unit": unit}
+
+    deltas = np.diff(ticks)  # int64 arithmetic wraps, so the round trip is exact even with NaT
+    if (deltas == deltas[0]).all():
+        return {"date_start": int(ticks[0]), "date_freq": int(deltas[0]), "date_delta": b"", "date_unit": unit}
+
+    return {
+        "date_start": int(ticks[0]),
+        "date_freq": 0,
+        "date_delta": _compress(_shuffle_bytes(np.ascontiguousarray(deltas, dtype=np.int64))),
+        "date_unit": unit,
+    }
+
+def decode_dates(date_start, date_freq, date_delta, date_unit, length):
+    """
+    Rebuilds the datetime64 array of a series, in its stored unit, from its encoded form.
+    """
+    if length == 0:
+        return np.array([], dtype=f"datetime64[{date_unit}]")
+
+    if date_delta:
+        deltas = _unshuffle_bytes(_decompress(date_delta), np.int64, length - 1)
+        ticks = np.empty(length, dtype=np.int64)
+        ticks[0] = date_start
+        np.cumsum(deltas, out=ticks[1:])
+        ticks[1:] += date_start
+    else:
+        ticks = date_start + date_freq * np.arange(length, dtype=np.int64)
+
+    return ticks.view(f"datetime64[{date_unit}]")
+
+# ======================================================================
+# VALUE ENCODING
+# ======================================================================
+
+def encode_values(values):
+    """
+    Encodes a (n_columns, n_points) float matrix with a byte-shuffle + zstd codec.
+    The bit patterns are delta-encoded first only if that gives a smaller blob, which is
+    typical for random walks but not for noisy, rounded or integer-valued series.
+
+    Returns:
+        dict: {"value": bytes, "value_shape": [n_columns, n_points], "value_delta": bool}
+    """
+    matrix = np.ascontiguousarray(np.asarray(values, dtype=np.float32))
+    if matrix.ndim == 1:
+        matrix = matrix[np.newaxis, :]
+
+    plain = _compress(_shuffle_bytes(matrix.reshape(-1)))
+
+    # Delta on the raw bit patterns keeps NaN/inf intact and is exactly reversible
+    bits = matrix.view(np.int32)
+    deltas = np.diff(bits, axis=1, prepend=np.zeros((bits.shape[0], 1), dtype=np.int32))
+    delta = _compress(_shuffle_bytes(np.ascontiguousarray(deltas).reshape(-1)))
+
+    use_delta = len(delta) < len(plain)
+    return {
+        "value": delta if use_delta else plain,
+        "value_shape": list(matrix.shape),
+        "value_delta": use_delta,
+    }
+
+def decode_values(value, value_shape, value_delta):
+    """
+    Rebuilds the float32 (n_columns, n_points) matrix of a series from its encoded form.
+    """
+    n_columns, n_points = value_shape
+    if n_columns * n_points == 0:
+        return np.zeros((n_columns, n_points), dtype=np.float32)
+
+    words = _unshuffle_bytes(_decompress(value), np.int32, n_columns * n_points).reshape(n_columns, n_points)
+    if value_delta:
+        words = np.cumsum(words, axis=1, dtype=np.int32)
+    return words.view(np.float32)
+
+# ======================================================================
+# EXAMPLE LEVEL API
+# ======================================================================
+
+def encode_example(dates, values):
+    """
+    Encodes the dates and values of one series into the compact feature columns.
+    """
+    encoded = encode_values(values)
+    encoded.update(encode_dates(dates))
+    return encoded
+
+def decode_example(example):
+    """
+    Decodes one compact example, replacing the encoded columns with "date" and "value" arrays.
+    """
+    decoded = {key: val for key, val in example.items() if key not in COMPACT_FEATURE_NAMES}
+    values = decode_values(example["value"], example["value_shape"], example["value_delta"])
+    decoded["date"] = decode_dates(example["date_start"], example["date_freq"], example["date_delta"],
+                                   example["date_unit"], values.shape[1])
+    decoded["value"] = values
+    return decoded
+
+def decode_batch(batch):
+    """
+    Decodes a batch of compact examples. Intended for lazy decoding on access:
+
+        dataset = dataset.with_transform(decode_batch)
+
+    Rows (`dataset[0]`, `dataset[:10]`, iteration) are decoded. Single-column access such as
+    `dataset["value"]` only receives part of the encoding, so it is returned still encoded.
+    """
+    if not all(name in batch for name in COMPACT_FEATURE_NAMES):
+        return batch
+
+    size = len(batch["value"])
+    examples = [decode_example({key: column[i] for key, column in batch.items()}) for i in range(size)]
+    return {key: [example[key] for example in examples] for key in (examples[0] if examples else batch)}
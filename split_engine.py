@@ -0,0 +1,131 @@
+"""Deterministic, leakage-free train/test split engine for the time-series corpus.
+
+Two split modes are supported:
+1. "dataset":  every file of a Kaggle dataset goes to the same side, chosen by a stable
+               hash of its datasetID, so related files never leak across the split
+2. "temporal": every series is sorted by date and cut in time. The test side holds either
+               the same last N points or every point on or after a date for all series, or a
+               per-series share of the points computed from that series' DataPoints metadata
+Split plans are computed from the configuration metadata alone, without reading any series.
+"""
+
+import hashlib
+import math
+import pandas as pd
+
+# ======================================================================
+# GLOBAL CONFIGURATION
+# ======================================================================
+
+SPLIT_MODES = ("dataset", "temporal")
+TRAIN, TEST = "train", "test"
+
+# ======================================================================
+# HASH BASED ASSIGNMENT
+# ======================================================================
+
+def hash_fraction(key, seed=""):
+    """
+    Maps a key to a stable number in [0, 1), independent of download order and platform.
+    """
+    digest = hashlib.sha1(f"{seed}|{key}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+def assign_dataset_split(dataset_id, test_fraction=0.2, seed=""):
+    """
+    Assigns a whole dataset to the train or test split based on its datasetID.
+    """
+    return TEST if hash_fraction(dataset_id, seed) < test_fraction else TRAIN
+
+# ======================================================================
+# TEMPORAL CUTOFFS
+# ======================================================================
+
+def fraction_cutoff(dataset_info, holdout_fraction):
+    """
+    Returns how many trailing points of a series go to test, as a share of its DataPoints metadata.
+    Returns None when DataPoints is not a number.
+    """
+    data_points = pd.to_numeric(dataset_info["DataPoints"], errors='coerce')
+    if pd.isna(data_points):
+        return None
+    return math.ceil(holdout_fraction * int(data_points))
+
+def temporal_cutoff(dataset_info, holdout_points=None, holdout_date=None, holdout_fraction=None):
+    """
+    Returns the cutoff of a series: a point count for `holdout_points` (global) or
+    `holdout_fraction` (per series), a Timestamp for `holdout_date`, or None if it cannot be computed.
+    """
+    if holdout_points is not None:
+        return holdout_points
+    if holdout_fraction is not None:
+        return fraction_cutoff(dataset_info, holdout_fraction)
+    return pd.Timestamp(holdout_date)
+
+def holdout_mask(dates, cutoff):
+    """
+    Boolean mask of the rows that belong to the test side of a temporally split series.
+    `dates` must be sorted in time order and holds either datetimes or 'YYYY-MM-DD HH:MM:SS'
+    strings, which compare in time order. Timezones are dropped (converted to UTC) before
+    comparing. Rows with missing dates stay in train.
+    """
+    if isinstance(cutoff, pd.Timestamp):
+        if cutoff.tz is not None:
+            cutoff = cutoff.tz_convert(None)
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            cutoff = cutoff.strftime('%Y-%m-%d %H:%M:%S')
+        elif dates.dt.tz is not None:
+            dates = dates.dt.tz_convert(None)
+        return (dates >= cutoff).to_numpy()
+
+    # Last `cutoff` points, capped on the rows that were actually read
+    return pd.RangeIndex(len(dates)).to_numpy() >= len(dates) - min(cutoff, len(dates))
+
+# ======================================================================
+# SPLIT PLAN
+# ======================================================================
+
+def plan_splits(datasets_config, downloaded_files, split_mode="dataset", test_fraction=0.2,
+                seed="", holdout_points=None, holdout_date=None, holdout_fraction=None):
+    """
+    Builds the split plan for the downloaded files.
+
+    Args:
+        datasets_config: {dataset_name: [dataset_config_entries]} from the configuration loader
+        downloaded_files: {"dataset_name|file_name": local_csv_path}
+
+    Returns:
+        dict: {split: {key: (filepath, cutoff)}}. The cutoff is None in "dataset" mode, and the
+              same key appears in both splits in "temporal" mode.
+    """
+    if split_mode not in SPLIT_MODES:
+        raise ValueError(f"Unknown split mode '{split_mode}', expected one of {SPLIT_MODES}")
+    if not 0 <= test_fraction <= 1:
+        raise ValueError(f"'test_fraction' must be between 0 and 1, got {test_fraction}")
+    if split_mode == "temporal":
+        if sum(option is not None for option in (holdout_points, holdout_date, holdout_fraction)) != 1:
+            raise ValueError("Temporal splits need exactly one of 'holdout_points', 'holdout_date' or 'holdout_fraction'")
+        if holdout_points is not None and holdout_points < 0:
+            raise ValueError(f"'holdout_points' must not be negative, got {holdout_points}")
+        if holdout_fraction is not None and not 0 <= holdout_fraction <= 1:
+            raise ValueError(f"'holdout_fraction' must be between 0 and 1, got {holdout_fraction}")
+
+    plan = {TRAIN: {}, TEST: {}}
+    for key, filepath in sorted(downloaded_files.items()):
+        dataset_name, file_name = key.split("|", 1)
+        dataset_info = next((d for d in datasets_config.get(dataset_name, []) if d["file_name"] == file_name), None)
+        if dataset_info is None:
+            continue
+
+        if split_mode == "dataset":
+            split = assign_dataset_split(dataset_info["datasetID"], test_fraction, seed)
+            plan[split][key] = (filepath, None)
+        else:
+            cutoff = temporal_cutoff(dataset_info, holdout_points, holdout_date, holdout_fraction)
+            if cutoff is None:
+                print(f"Skipping {key}: DataPoints '{dataset_info['DataPoints']}' is not a number.")
+                continue
+            plan[TRAIN][key] = (filepath, cutoff)
+            plan[TEST][key] = (filepath, cutoff)
+
+    return plan